@@ -30,6 +30,8 @@ class Config:
         
         # Telegram configuration
         self.TELEGRAM_CHANNEL = os.getenv('TELEGRAM_CHANNEL', os.getenv('TELEGRAM_CHENNAL', '@Amazon_Flipkartt_Offers'))
+        # Optional chat where broadcasts are rendered once and copied to users
+        self.LOG_CHAT_ID = os.getenv('LOG_CHAT_ID', '')
         
         # Scraping configuration
         self.MAX_DEALS_PER_SOURCE = int(os.getenv('MAX_DEALS_PER_SOURCE', '5'))
@@ -7,7 +7,8 @@ import asyncio
 import json
 import logging
 import random
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 import aiohttp
 
 try:
@@ -24,12 +25,16 @@ logger = logging.getLogger(__name__)
 class ContentGenerator:
     """AI-powered content generator using OpenAI GPT-4o."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, message_cache_size: int = 4096):
         """Initialize content generator."""
         self.api_key = api_key
         self.client = None
         self.fallback_mode = not (OPENAI_AVAILABLE and api_key)
         
+        # LRU of rendered deal messages keyed by (deal_id, affiliate_link, style)
+        self.message_cache_size = message_cache_size
+        self._message_cache: OrderedDict[Tuple[int, str, str], str] = OrderedDict()
+        
         if self.fallback_mode:
             logger.warning("🤖 OpenAI not available - using fallback content generation")
         elif OPENAI_AVAILABLE:
@@ -114,6 +119,29 @@ class ContentGenerator:
                 logger.error(f"OpenAI content generation failed: {e}")
             return self._generate_fallback_message(product, affiliate_link, style)
     
+    async def generate_deal_message(self, deal_id: Optional[int], product: Product,
+                                    affiliate_link: str, style: str = "enthusiastic") -> str:
+        """Generate a Telegram message for a stored deal, memoized per deal."""
+        if deal_id is None:
+            return await self.generate_telegram_message(product, affiliate_link, style)
+        
+        key = (deal_id, affiliate_link, style)
+        cached = self._message_cache.get(key)
+        if cached is not None:
+            self._message_cache.move_to_end(key)
+            return cached
+        
+        message = await self.generate_telegram_message(product, affiliate_link, style)
+        self._message_cache[key] = message
+        if len(self._message_cache) > self.message_cache_size:
+            self._message_cache.popitem(last=False)
+        
+        return message
+    
+    def clear_message_cache(self):
+        """Drop memoized deal messages (e.g. after old deals are removed)."""
+        self._message_cache.clear()
+    
     async def generate_deal_description(self, product: Product, style: str = "professional") -> str:
         """Generate a detailed deal description."""
         if self.fallback_mode:
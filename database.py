@@ -5,7 +5,7 @@ PostgreSQL database manager for Amazon Affiliate Deal Bot.
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Set
 import asyncpg
 from models import Deal, User, DealStats, Product, ClickEvent
 
@@ -15,19 +15,31 @@ logger = logging.getLogger(__name__)
 class DatabaseManager:
     """PostgreSQL database manager with async support."""
     
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, min_pool_size: int = 2, max_pool_size: int = 10,
+                 health_check_interval: int = 30, statement_cache_size: int = 200):
         """Initialize database manager."""
         self.database_url = database_url
+        self.min_pool_size = min_pool_size
+        self.max_pool_size = max_pool_size
+        self.health_check_interval = health_check_interval
+        self.statement_cache_size = statement_cache_size
         self.pool: Optional[asyncpg.Pool] = None
+        self._health_check_task: Optional[asyncio.Task] = None
         
     async def initialize(self):
         """Initialize database connection pool and create tables."""
+        if self.pool:
+            # Already initialized (the bot calls this again from start_polling)
+            return
         try:
             # Create connection pool with SSL configuration for Neon
             self.pool = await asyncpg.create_pool(
                 self.database_url,
-                min_size=1,
-                max_size=10,
+                min_size=self.min_pool_size,
+                max_size=self.max_pool_size,
+                max_inactive_connection_lifetime=300,
+                # Prepared statements are cached per connection, so polled queries skip PARSE/PLAN
+                statement_cache_size=self.statement_cache_size,
                 command_timeout=60,
                 ssl='require'
             )
@@ -35,6 +47,9 @@ class DatabaseManager:
             # Create tables
             await self._create_tables()
             
+            # Keep the pool warm and surface dead connections early
+            self._health_check_task = asyncio.create_task(self._health_check_loop())
+            
             logger.info("✅ PostgreSQL database initialized")
             
         except Exception as e:
@@ -43,10 +58,40 @@ class DatabaseManager:
     
     async def close(self):
         """Close database connection pool."""
+        if self._health_check_task:
+            self._health_check_task.cancel()
+            try:
+                await self._health_check_task
+            except asyncio.CancelledError:
+                pass
+            self._health_check_task = None
         if self.pool:
             await self.pool.close()
+            self.pool = None
             logger.info("📊 Database connections closed")
     
+    async def _health_check_loop(self):
+        """Periodically ping the database (pool pre-ping equivalent)."""
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                async with self.pool.acquire() as conn:
+                    await conn.fetchval("SELECT 1")
+            except Exception as e:
+                logger.warning(f"Database health check failed: {e}")
+    
+    async def ping(self, timeout: float = 0.5) -> bool:
+        """Check that the database answers a trivial query within `timeout` seconds."""
+        if not self.pool:
+            return False
+        try:
+            async with self.pool.acquire(timeout=timeout) as conn:
+                await conn.fetchval("SELECT 1", timeout=timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"Database ping failed: {e}")
+            return False
+    
     async def _create_tables(self):
         """Create database tables if they don't exist."""
         async with self.pool.acquire() as conn:
@@ -110,11 +155,25 @@ class DatabaseManager:
                 )
             """)
             
+            # ASINs Telegram permanently rejected; skipped by future posting runs
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS poisoned_asins (
+                    asin VARCHAR(20) PRIMARY KEY,
+                    reason TEXT,
+                    poisoned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
             # Create indexes for better performance
             await conn.execute("CREATE INDEX IF NOT EXISTS idx_deals_asin ON deals(asin)")
             await conn.execute("CREATE INDEX IF NOT EXISTS idx_deals_posted_at ON deals(posted_at)")
             await conn.execute("CREATE INDEX IF NOT EXISTS idx_deals_category ON deals(category)")
             await conn.execute("CREATE INDEX IF NOT EXISTS idx_users_user_id ON users(user_id)")
+            
+            # Partial indexes matching the is_active = TRUE filter on recent-deal and active-user queries
+            await conn.execute("CREATE INDEX IF NOT EXISTS idx_deals_active_posted_at ON deals(posted_at DESC) WHERE is_active = TRUE")
+            await conn.execute("CREATE INDEX IF NOT EXISTS idx_deals_active_category_posted_at ON deals(category, posted_at DESC) WHERE is_active = TRUE")
+            await conn.execute("CREATE INDEX IF NOT EXISTS idx_users_active_last_seen ON users(last_seen DESC) WHERE is_active = TRUE")
             await conn.execute("CREATE INDEX IF NOT EXISTS idx_click_events_deal_id ON click_events(deal_id)")
             
             logger.info("📋 Database tables created/verified")
@@ -148,6 +207,27 @@ class DatabaseManager:
                 logger.info(f"👤 New user added: {first_name or username or user_id}")
                 return self._row_to_user(row)
     
+    async def add_users_bulk(self, users: List[tuple]) -> int:
+        """Add or touch many users in one statement.
+        
+        Each entry is (user_id, username, first_name, last_name). New users are
+        inserted; existing users only get last_seen updated, like add_user.
+        """
+        # Deduplicate by user_id - ON CONFLICT cannot update the same row twice
+        unique = {entry[0]: entry for entry in users}
+        if not unique:
+            return 0
+        
+        user_ids, usernames, first_names, last_names = zip(*unique.values())
+        async with self.pool.acquire() as conn:
+            await conn.execute("""
+                INSERT INTO users (user_id, username, first_name, last_name)
+                SELECT * FROM unnest($1::bigint[], $2::text[], $3::text[], $4::text[])
+                ON CONFLICT (user_id) DO UPDATE SET last_seen = CURRENT_TIMESTAMP
+            """, list(user_ids), list(usernames), list(first_names), list(last_names))
+        
+        return len(unique)
+    
     async def get_user(self, user_id: int) -> Optional[User]:
         """Get user by Telegram user ID."""
         async with self.pool.acquire() as conn:
@@ -196,6 +276,27 @@ class DatabaseManager:
             
             return [self._row_to_user(row) for row in rows]
     
+    async def count_active_users(self, days: int = 30) -> int:
+        """Count users active in the last N days."""
+        async with self.pool.acquire() as conn:
+            cutoff_date = datetime.utcnow() - timedelta(days=days)
+            return await conn.fetchval("""
+                SELECT COUNT(*) FROM users 
+                WHERE is_active = TRUE AND last_seen >= $1
+            """, cutoff_date)
+    
+    async def iter_active_user_ids(self, days: int = 30, page_size: int = 500) -> AsyncIterator[List[int]]:
+        """Yield IDs of users active in the last N days in pages, via a server-side cursor."""
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                cursor = await conn.cursor("""
+                    SELECT user_id FROM users 
+                    WHERE is_active = TRUE AND last_seen >= $1
+                """, cutoff_date)
+                while page := await cursor.fetch(page_size):
+                    yield [row['user_id'] for row in page]
+    
     # Deal management methods
     
     async def add_deal(self, product: Product, affiliate_link: str, 
@@ -219,6 +320,48 @@ class DatabaseManager:
             logger.info(f"💰 Deal added: {product.title[:50]}...")
             return self._row_to_deal(row)
     
+    async def add_deals_bulk(self, entries: List[tuple]) -> int:
+        """Add many deals in one batched insert.
+        
+        Each entry is (product, affiliate_link, source, content_style). The batch is
+        atomic, so if it fails the rows are retried one by one and only bad rows are
+        skipped. Returns the number of deals stored.
+        """
+        if not entries:
+            return 0
+        
+        query = """
+            INSERT INTO deals (
+                title, price, discount, category, source, asin,
+                affiliate_link, original_link, description,
+                content_style, rating, review_count, image_url
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+        """
+        rows = [
+            (product.title, product.price, product.discount, product.category,
+             source, product.asin, affiliate_link, product.link,
+             product.description, content_style, product.rating,
+             product.review_count, product.image_url)
+            for product, affiliate_link, source, content_style in entries
+        ]
+        
+        async with self.pool.acquire() as conn:
+            try:
+                await conn.executemany(query, rows)
+                stored = len(rows)
+            except asyncpg.PostgresError as e:
+                logger.warning(f"Batch deal insert failed ({e}), retrying row by row")
+                stored = 0
+                for row in rows:
+                    try:
+                        await conn.execute(query, *row)
+                        stored += 1
+                    except asyncpg.PostgresError as row_error:
+                        logger.error(f"Error adding deal {row[0][:50]}: {row_error}")
+        
+        logger.info(f"💰 {stored} deals added")
+        return stored
+    
     async def get_deal(self, deal_id: int) -> Optional[Deal]:
         """Get deal by ID."""
         async with self.pool.acquire() as conn:
@@ -236,6 +379,28 @@ class DatabaseManager:
             )
             return self._row_to_deal(row) if row else None
     
+    async def get_existing_asins(self, asins: List[str], poison_days: int = 7) -> Set[str]:
+        """Return which of the given ASINs already have a deal or were poisoned in the last N days, in one query."""
+        if not asins:
+            return set()
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT asin FROM deals WHERE asin = ANY($1::text[])
+                UNION
+                SELECT asin FROM poisoned_asins
+                WHERE asin = ANY($1::text[])
+                AND poisoned_at > NOW() - make_interval(days => $2)
+            """, list(asins), poison_days)
+            return {row['asin'] for row in rows}
+    
+    async def mark_asin_poisoned(self, asin: str, reason: str = "") -> None:
+        """Record an ASIN that Telegram rejected so it is skipped for a while."""
+        async with self.pool.acquire() as conn:
+            await conn.execute("""
+                INSERT INTO poisoned_asins (asin, reason) VALUES ($1, $2)
+                ON CONFLICT (asin) DO UPDATE SET reason = EXCLUDED.reason, poisoned_at = CURRENT_TIMESTAMP
+            """, asin, reason)
+    
     async def get_recent_deals(self, hours: int = 24, limit: int = 50, 
                              category: str = None) -> List[Deal]:
         """Get recent deals."""
@@ -259,6 +424,29 @@ class DatabaseManager:
             
             return [self._row_to_deal(row) for row in rows]
     
+    async def count_recent_deals(self, hours: int = 24) -> int:
+        """Count active deals posted in the last N hours."""
+        async with self.pool.acquire() as conn:
+            cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+            return await conn.fetchval("""
+                SELECT COUNT(*) FROM deals 
+                WHERE is_active = TRUE AND posted_at >= $1
+            """, cutoff_time)
+    
+    async def get_deals_for_user(self, user_id: int, hours: int = 24, 
+                                 limit: int = 5) -> List[Deal]:
+        """Get recent deals filtered by the user's category preference."""
+        async with self.pool.acquire() as conn:
+            cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+            rows = await conn.fetch("""
+                SELECT d.* FROM deals d
+                WHERE d.is_active = TRUE AND d.posted_at >= $2
+                AND COALESCE((SELECT category FROM users WHERE user_id = $1), 'all') IN ('all', d.category)
+                ORDER BY d.posted_at DESC LIMIT $3
+            """, user_id, cutoff_time, limit)
+            
+            return [self._row_to_deal(row) for row in rows]
+    
     async def update_deal_stats(self, deal_id: int, clicks: int = 0, 
                                conversions: int = 0, earnings: float = 0.0) -> bool:
         """Update deal statistics."""
@@ -317,21 +505,21 @@ class DatabaseManager:
                 AND last_seen >= NOW() - INTERVAL '30 days'
             """)
             
-            # Category stats
+            # Category stats (NULL grouped as 'unknown', like the in-memory manager)
             category_rows = await conn.fetch("""
-                SELECT category, COUNT(*) as count
+                SELECT COALESCE(category, 'unknown') as category, COUNT(*) as count
                 FROM deals 
                 WHERE is_active = TRUE
-                GROUP BY category
+                GROUP BY 1
                 ORDER BY count DESC
             """)
             
             # Source stats
             source_rows = await conn.fetch("""
-                SELECT source, COUNT(*) as count
+                SELECT COALESCE(source, 'unknown') as source, COUNT(*) as count
                 FROM deals 
                 WHERE is_active = TRUE
-                GROUP BY source
+                GROUP BY 1
                 ORDER BY count DESC
             """)
             
@@ -5,7 +5,7 @@ Used as fallback when PostgreSQL is not available.
 
 import logging
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Set
 from models import Deal, User, DealStats, Product, ClickEvent
 
 logger = logging.getLogger(__name__)
@@ -19,6 +19,7 @@ class SimpleDatabaseManager:
         self.users: Dict[int, User] = {}
         self.deals: Dict[int, Deal] = {}
         self.click_events: List[ClickEvent] = []
+        self.poisoned_asins: Dict[str, datetime] = {}
         self.next_deal_id = 1
         self.next_user_id = 1
         self.next_click_id = 1
@@ -33,6 +34,10 @@ class SimpleDatabaseManager:
         """Close database (no-op for in-memory)."""
         logger.info("📊 Simple database closed")
     
+    async def ping(self, timeout: float = 0.5) -> bool:
+        """In-memory database is always reachable."""
+        return True
+    
     # User management methods
     
     async def add_user(self, user_id: int, username: str = None, 
@@ -60,6 +65,12 @@ class SimpleDatabaseManager:
             logger.info(f"👤 New user added: {first_name or username or user_id}")
             return user
     
+    async def add_users_bulk(self, users: List[tuple]) -> int:
+        """Add or touch many users; entries are (user_id, username, first_name, last_name)."""
+        for user_id, username, first_name, last_name in users:
+            await self.add_user(user_id, username, first_name, last_name)
+        return len({entry[0] for entry in users})
+    
     async def get_user(self, user_id: int) -> Optional[User]:
         """Get user by Telegram user ID."""
         return self.users.get(user_id)
@@ -85,6 +96,16 @@ class SimpleDatabaseManager:
             if user.is_active and user.last_seen and user.last_seen >= cutoff_date
         ]
     
+    async def count_active_users(self, days: int = 30) -> int:
+        """Count users active in the last N days."""
+        return len(await self.get_active_users(days))
+    
+    async def iter_active_user_ids(self, days: int = 30, page_size: int = 500) -> AsyncIterator[List[int]]:
+        """Yield IDs of users active in the last N days in pages."""
+        user_ids = [user.user_id for user in await self.get_active_users(days)]
+        for i in range(0, len(user_ids), page_size):
+            yield user_ids[i:i + page_size]
+    
     # Deal management methods
     
     async def add_deal(self, product: Product, affiliate_link: str, 
@@ -115,6 +136,12 @@ class SimpleDatabaseManager:
         logger.info(f"💰 Deal added: {product.title[:50]}...")
         return deal
     
+    async def add_deals_bulk(self, entries: List[tuple]) -> int:
+        """Add many deals; entries are (product, affiliate_link, source, content_style)."""
+        for product, affiliate_link, source, content_style in entries:
+            await self.add_deal(product, affiliate_link, source, content_style)
+        return len(entries)
+    
     async def get_deal(self, deal_id: int) -> Optional[Deal]:
         """Get deal by ID."""
         return self.deals.get(deal_id)
@@ -126,6 +153,30 @@ class SimpleDatabaseManager:
                 return deal
         return None
     
+    async def get_existing_asins(self, asins: List[str], poison_days: int = 7) -> Set[str]:
+        """Return which of the given ASINs already have a deal or were poisoned in the last N days."""
+        wanted = set(asins)
+        cutoff_time = datetime.utcnow() - timedelta(days=poison_days)
+        return {
+            deal.asin for deal in self.deals.values()
+            if deal.is_active and deal.asin in wanted
+        } | {
+            asin for asin in wanted
+            if self.poisoned_asins.get(asin, datetime.min) > cutoff_time
+        }
+    
+    async def mark_asin_poisoned(self, asin: str, reason: str = "") -> None:
+        """Record an ASIN that Telegram rejected so it is skipped for a while."""
+        self.poisoned_asins[asin] = datetime.utcnow()
+    
+    async def count_recent_deals(self, hours: int = 24) -> int:
+        """Count active deals posted in the last N hours."""
+        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+        return sum(
+            1 for deal in self.deals.values()
+            if deal.is_active and deal.posted_at and deal.posted_at >= cutoff_time
+        )
+    
     async def get_recent_deals(self, hours: int = 24, limit: int = 50, 
                              category: str = None) -> List[Deal]:
         """Get recent deals."""
@@ -143,6 +194,13 @@ class SimpleDatabaseManager:
         filtered_deals.sort(key=lambda x: x.posted_at or datetime.min, reverse=True)
         return filtered_deals[:limit]
     
+    async def get_deals_for_user(self, user_id: int, hours: int = 24, 
+                                 limit: int = 5) -> List[Deal]:
+        """Get recent deals filtered by the user's category preference."""
+        user = self.users.get(user_id)
+        category = user.category if user else None
+        return await self.get_recent_deals(hours=hours, limit=limit, category=category)
+    
     async def update_deal_stats(self, deal_id: int, clicks: int = 0, 
                                conversions: int = 0, earnings: float = 0.0) -> bool:
         """Update deal statistics."""
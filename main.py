@@ -10,7 +10,8 @@ import os
 import signal
 import sys
 import threading
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from aiogram import types
 
@@ -28,6 +29,7 @@ from database import DatabaseManager
 from database_simple import SimpleDatabaseManager
 from content_generator import ContentGenerator
 from scraper import DealScraper
+from link_validator import LinkValidator
 
 # Configure logging
 logging.basicConfig(
@@ -107,6 +109,9 @@ class DealBotApplication:
             
             # Initialize web dashboard
             self.web_app = create_app(self.config)
+            if self.bot:
+                self.bot.deals_changed_callbacks.append(self.web_app.api_cache.clear)
+                self.bot.deals_changed_callbacks.append(self.web_app.data_manager.invalidate_stats)
             logger.info("🌐 Web dashboard initialized")
             
             logger.info("✅ All components initialized successfully")
@@ -154,7 +159,6 @@ class DealBotApplication:
             logger.info("🚀 Starting hybrid mode (bot + web dashboard)...")
             
             def run_web():
-                import time
                 try:
                     time.sleep(1)
                     port = int(os.environ.get("PORT", self.config.FLASK_PORT))  # ✅ Heroku fix
@@ -194,8 +198,6 @@ class DealBotApplication:
             return 0
         
         try:
-            from link_validator import LinkValidator
-            
             # Get new deals from scraper
             scraper = DealScraper(
                 max_deals_per_source=self.config.MAX_DEALS_PER_SOURCE
@@ -241,7 +243,6 @@ class DealBotApplication:
                         try:
                             existing = await self.db_manager.get_deal_by_asin(product.asin)
                             if existing and hasattr(existing, 'posted_at') and existing.posted_at:
-                                from datetime import datetime, timedelta, timezone
                                 now = datetime.now(timezone.utc)
                                 # Handle timezone-aware/naive datetime comparison safely
                                 if existing.posted_at.tzinfo is None:
@@ -375,6 +376,13 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Use uvloop's libuv-based event loop when available
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     try:
         exit_code = asyncio.run(main())
         sys.exit(exit_code)
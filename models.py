@@ -5,12 +5,13 @@ Database models for Amazon Affiliate Deal Bot.
 from datetime import datetime
 from typing import Optional, Dict, Any
 from dataclasses import dataclass, field
+from functools import cached_property
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     """Product model representing an Amazon product."""
     title: str
@@ -71,8 +72,9 @@ class Deal:
     updated_at: Optional[datetime] = None
     is_active: bool = True
     
-    def to_product(self) -> Product:
-        """Convert deal to product model."""
+    @cached_property
+    def product(self) -> Product:
+        """Product view of this deal, built once per instance (deal rows are immutable)."""
         return Product(
             title=self.title,
             price=self.price,
@@ -86,6 +88,10 @@ class Deal:
             image_url=self.image_url
         )
     
+    def to_product(self) -> Product:
+        """Convert deal to product model."""
+        return self.product
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
@@ -139,6 +139,7 @@ class TaskScheduler:
                 deleted_count = await self.bot.db_manager.cleanup_old_deals(days=30)
                 
                 if deleted_count > 0:
+                    self.bot.content_generator.clear_message_cache()
                     logger.info(f"✅ Database cleanup: Removed {deleted_count} old deals")
                 else:
                     logger.info("ℹ️ Database cleanup: No old deals to remove")
@@ -196,6 +197,8 @@ class TaskScheduler:
                 case 'cleanup_database':
                     logger.info("🚀 Running immediate database cleanup...")
                     count = await self.bot.db_manager.cleanup_old_deals()
+                    if count > 0:
+                        self.bot.content_generator.clear_message_cache()
                     logger.info(f"✅ Immediate cleanup completed: {count} deals removed")
                     return True
                     
@@ -7,14 +7,80 @@ import asyncio
 import logging
 import aiohttp
 import re
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 from models import Product
+from rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Precompiled number patterns (commas are stripped from the match only)
+_PRICE_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)')
+_REVIEW_COUNT_RE = re.compile(r'(\d[\d,]*)')
+
+# Category keywords
+CATEGORY_KEYWORDS = {
+    'electronics': ['phone', 'tablet', 'laptop', 'speaker', 'headphone', 'camera', 'tv', 'smart', 'wireless'],
+    'home': ['kitchen', 'cooking', 'chair', 'table', 'lamp', 'bed', 'pillow', 'blanket'],
+    'fashion': ['shirt', 'pants', 'dress', 'shoes', 'jacket', 'jeans', 'clothing'],
+    'sports': ['fitness', 'exercise', 'gym', 'workout', 'sports', 'running', 'yoga'],
+    'beauty': ['beauty', 'skincare', 'makeup', 'hair', 'cosmetic', 'shampoo'],
+    'books': ['book', 'kindle', 'novel', 'textbook', 'magazine']
+}
+
+
+@lru_cache(maxsize=4096)
+def _determine_category(title: str) -> str:
+    """Determine product category from title (memoized, titles repeat across runs)."""
+    title_lower = title.lower()
+    
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        if any(keyword in title_lower for keyword in keywords):
+            return category
+    
+    return 'general'
+
+
+# Sample deals served when live scraping yields nothing (built once at import)
+_FALLBACK_DEALS = (
+    Product(
+        title="Wireless Bluetooth Headphones - Noise Cancelling",
+        price="$29.99",
+        discount="40% off",
+        link="https://www.amazon.in/dp/B08N5WRWNW",
+        category="electronics",
+        asin="B08N5WRWNW",
+        description="High-quality wireless headphones with active noise cancellation",
+        rating=4.5,
+        review_count=2847
+    ),
+    Product(
+        title="Smart Home Security Camera 1080p HD",
+        price="$39.95",
+        discount="50% off",
+        link="https://www.amazon.in/dp/B07DGR98VQ",
+        category="electronics",
+        asin="B07DGR98VQ",
+        description="Indoor security camera with night vision and motion detection",
+        rating=4.3,
+        review_count=1256
+    ),
+    Product(
+        title="Kitchen Stand Mixer 6-Speed",
+        price="$79.99",
+        discount="35% off",
+        link="https://www.amazon.in/dp/B075R2Z1CN",
+        category="home",
+        asin="B075R2Z1CN",
+        description="Powerful stand mixer for all your baking needs",
+        rating=4.6,
+        review_count=934
+    )
+)
+
 
 class DealScraper:
     """Real-time Amazon deal scraper with no mock data."""
@@ -48,7 +114,8 @@ class DealScraper:
         }
         
         # Rate limiting delay to avoid being blocked
-        self.rate_limit_delay = 5  # seconds between requests
+        self.rate_limit_delay = 5  # seconds between requests to the same host
+        self._host_buckets: Dict[str, TokenBucket] = {}
         
     async def initialize(self):
         """Initialize async session."""
@@ -77,9 +144,6 @@ class DealScraper:
                 deals = await self._scrape_source(source_url)
                 all_deals.extend(deals[:self.max_deals_per_source])
                 
-                # Increased rate limiting to avoid being blocked
-                await asyncio.sleep(self.rate_limit_delay)
-                
             except Exception as e:
                 logger.warning(f"Failed to scrape {source_url}: {e}")
                 continue
@@ -109,6 +173,13 @@ class DealScraper:
             return []
             
         try:
+            # Pace requests per host so unrelated hosts never wait on each other
+            host = urlparse(url).netloc
+            bucket = self._host_buckets.get(host)
+            if bucket is None:
+                bucket = self._host_buckets[host] = TokenBucket(rate=1 / self.rate_limit_delay)
+            await bucket.acquire()
+            
             async with self.session.get(url) as response:
                 if response.status == 429:
                     logger.warning(f"Rate limited by {url}, increasing delay")
@@ -119,14 +190,25 @@ class DealScraper:
                     return []
                 
                 html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                return self._parse_amazon_deals(soup, url)
-                
+            
+            # Captcha/interstitial pages carry no product markers - skip parsing
+            if 'data-asin' not in html and '/dp/' not in html:
+                logger.warning(f"No product markers in response from {url}, skipping parse")
+                return []
+            
+            # Parse in a worker thread so the event loop keeps serving sockets
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._parse_html_sync, html, url)
+            
         except Exception as e:
             logger.error(f"Error scraping {url}: {e}")
             return []
     
+    def _parse_html_sync(self, html: str, source_url: str) -> List[Product]:
+        """Build the soup and parse deals (CPU-bound, runs in executor)."""
+        soup = BeautifulSoup(html, 'html.parser')
+        return self._parse_amazon_deals(soup, source_url)
+    
     def _parse_amazon_deals(self, soup: BeautifulSoup, source_url: str) -> List[Product]:
         """Parse Amazon deal structures from HTML."""
         deals = []
@@ -161,9 +243,16 @@ class DealScraper:
             # Extract ASIN
             asin = element.get('data-asin')
             if not asin:
-                asin_match = re.search(r'/dp/([A-Z0-9]{10})', str(element))
-                if asin_match:
-                    asin = asin_match.group(1)
+                # Walk anchor hrefs directly instead of serializing the element
+                for anchor in element.find_all('a'):
+                    href = anchor.get('href', '')
+                    index = href.find('/dp/')
+                    if index != -1:
+                        candidate = href[index + 4:index + 14]
+                        if (len(candidate) == 10 and candidate.isascii()
+                                and candidate.isalnum() and candidate == candidate.upper()):
+                            asin = candidate
+                            break
             
             if not asin:
                 return None
@@ -218,7 +307,7 @@ class DealScraper:
             amazon_link = f"https://www.amazon.in/dp/{asin}"
             
             # Determine category
-            category = self._determine_category(title, element)
+            category = _determine_category(title)
             
             # Create product
             product = Product(
@@ -255,12 +344,13 @@ class DealScraper:
         if not price_text:
             return "Price not available"
         
-        # Extract price numbers
-        price_match = re.search(r'[\d,]+\.?\d*', price_text)
+        # Extract price numbers in a single pass
+        price_match = _PRICE_RE.search(price_text)
         if price_match:
-        price = price_match.group().replace(',', '')
-        return f"₹{price}"  # or use "$" if you're working with USD
+            return f"₹{price_match.group(1).replace(',', '')}"  # or use "$" if you're working with USD
         
+        return price_text[:50]  # Limit length
+    
     def _clean_discount(self, discount_text: str) -> str:
         """Clean and format discount text."""
         if not discount_text:
@@ -294,35 +384,15 @@ class DealScraper:
             return 0
         
         # Look for number patterns
-        number_match = re.search(r'([\d,]+)', review_text.replace(',', ''))
+        number_match = _REVIEW_COUNT_RE.search(review_text)
         if number_match:
             try:
-                return int(number_match.group(1))
+                return int(number_match.group(1).replace(',', ''))
             except:
                 pass
         
         return 0
     
-    def _determine_category(self, title: str, element) -> str:
-        """Determine product category from title and element."""
-        title_lower = title.lower()
-        
-        # Category keywords
-        category_map = {
-            'electronics': ['phone', 'tablet', 'laptop', 'speaker', 'headphone', 'camera', 'tv', 'smart', 'wireless'],
-            'home': ['kitchen', 'cooking', 'chair', 'table', 'lamp', 'bed', 'pillow', 'blanket'],
-            'fashion': ['shirt', 'pants', 'dress', 'shoes', 'jacket', 'jeans', 'clothing'],
-            'sports': ['fitness', 'exercise', 'gym', 'workout', 'sports', 'running', 'yoga'],
-            'beauty': ['beauty', 'skincare', 'makeup', 'hair', 'cosmetic', 'shampoo'],
-            'books': ['book', 'kindle', 'novel', 'textbook', 'magazine']
-        }
-        
-        for category, keywords in category_map.items():
-            if any(keyword in title_lower for keyword in keywords):
-                return category
-        
-        return 'general'
-    
     def _extract_description(self, element) -> str:
         """Extract product description or features."""
         desc_selectors = [
@@ -409,7 +479,7 @@ class DealScraper:
                     price=self._clean_price(price) if price else "Price not available",
                     discount=self._clean_discount(discount) if discount else "",
                     link=url,
-                    category=self._determine_category(title, soup),
+                    category=_determine_category(title),
                     asin=asin,
                     description=""
                 )
@@ -432,41 +502,7 @@ class DealScraper:
     
     def _generate_fallback_deals(self) -> List[Product]:
         """Generate fallback sample deals when scraping fails."""
-        sample_deals = [
-            Product(
-                title="Wireless Bluetooth Headphones - Noise Cancelling",
-                price="$29.99",
-                discount="40% off",
-                link="https://www.amazon.in/dp/B08N5WRWNW",
-                category="electronics",
-                asin="B08N5WRWNW",
-                description="High-quality wireless headphones with active noise cancellation",
-                rating=4.5,
-                review_count=2847
-            ),
-            Product(
-                title="Smart Home Security Camera 1080p HD",
-                price="$39.95",
-                discount="50% off",
-                link="https://www.amazon.in/dp/B07DGR98VQ",
-                category="electronics",
-                asin="B07DGR98VQ",
-                description="Indoor security camera with night vision and motion detection",
-                rating=4.3,
-                review_count=1256
-            ),
-            Product(
-                title="Kitchen Stand Mixer 6-Speed",
-                price="$79.99",
-                discount="35% off",
-                link="https://www.amazon.in/dp/B075R2Z1CN",
-                category="home",
-                asin="B075R2Z1CN",
-                description="Powerful stand mixer for all your baking needs",
-                rating=4.6,
-                review_count=934
-            )
-        ]
+        sample_deals = list(_FALLBACK_DEALS)
         
         logger.info(f"Generated {len(sample_deals)} fallback deals")
         return sample_deals
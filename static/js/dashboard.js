@@ -15,18 +15,24 @@ const cyberColors = {
     darkAlt: '#1a1a1a'
 };
 
+// In-flight dashboard load, shared by the refresh button and the poll timer
+let dashboardLoad = null;
+
 // Initialize dashboard
-async function loadDashboardData() {
-    try {
-        await Promise.all([
-            loadStatistics(),
-            loadDeals(),
-            updateCharts()
-        ]);
-    } catch (error) {
+function loadDashboardData() {
+    if (dashboardLoad) return dashboardLoad;
+    
+    dashboardLoad = Promise.all([
+        loadStatistics(),
+        loadDeals(),
+        updateCharts()
+    ]).catch(error => {
         console.error('Dashboard load error:', error);
         showNotification('System connection error', 'error');
-    }
+    }).finally(() => {
+        dashboardLoad = null;
+    });
+    return dashboardLoad;
 }
 
 // Load statistics data
@@ -352,11 +358,16 @@ function showNotification(message, type = 'info') {
 document.addEventListener('DOMContentLoaded', function() {
     console.log('Dashboard initializing...');
     
-    // Initial load
-    loadDashboardData();
-    
-    // Refresh data every 30 seconds
-    setInterval(loadDashboardData, 30000);
+    // Only the main dashboard page shows live stats
+    if (document.getElementById('total-deals')) {
+        // Initial load
+        loadDashboardData();
+        
+        // Refresh data every 30 seconds while the tab is visible
+        setInterval(() => {
+            if (!document.hidden) loadDashboardData();
+        }, 30000);
+    }
     
     // Handle window resize for chart responsiveness
     let resizeTimeout;
@@ -4,23 +4,38 @@ Uses aiogram 3.x for modern async Telegram bot functionality.
 """
 import asyncio
 import logging
-from typing import Optional, Union
+import random
+import re
+import time
+from typing import Callable, Optional, Union
 from datetime import datetime 
 from aiogram import types
 
 try:
     from aiogram import Bot, Dispatcher, types, F
+    from aiogram.client.session.aiohttp import AiohttpSession
     from aiogram.filters import Command
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-    from aiogram.exceptions import TelegramAPIError
+    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, InputMediaPhoto
+    from aiogram.exceptions import (
+        TelegramAPIError, TelegramBadRequest, TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+    )
+    from aiogram.methods import SendMessage, CopyMessage
     AIOGRAM_AVAILABLE = True
 except ImportError:
     AIOGRAM_AVAILABLE = False
     # Create dummy classes for type safety when aiogram is not available
     class Bot: pass
     class Dispatcher: pass
+    class AiohttpSession: pass
     class InlineKeyboardMarkup: pass
     class InlineKeyboardButton: pass
+    class InputMediaPhoto: pass
+    class SendMessage: pass
+    class CopyMessage: pass
+    class TelegramRetryAfter(Exception): pass
+    class TelegramBadRequest(Exception): pass
+    class TelegramNetworkError(Exception): pass
+    class TelegramServerError(Exception): pass
     class F: pass
     def Command(**kwargs): pass
 
@@ -29,10 +44,64 @@ from database import DatabaseManager
 from database_simple import SimpleDatabaseManager
 from content_generator import ContentGenerator
 from scraper import DealScraper
+from link_validator import LinkValidator
 from models import Deal, User
+from rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Seconds a recent-deals query result is reused across handlers
+DEALS_CACHE_TTL = 60
+
+# Pooled keep-alive connections to the Bot API: broadcast (20) + channel posts (5) + polling
+TELEGRAM_CONNECTION_LIMIT = 30
+
+# Users from /start are written in batches of up to this size, at most once per interval
+USER_UPSERT_BATCH_SIZE = 100
+USER_UPSERT_FLUSH_INTERVAL = 1.0
+
+# Posted deals are saved to the database after every this many successful posts
+DEAL_SAVE_BATCH_SIZE = 5
+
+# Telegram media group limits: 2-10 items, captions up to 1024 characters
+MEDIA_GROUP_MAX_ITEMS = 10
+MEDIA_CAPTION_MAX_LENGTH = 1024
+
+# Emoji shown next to categories in /stats
+CATEGORY_EMOJIS = {
+    'electronics': '📱',
+    'home': '🏠',
+    'fashion': '👕',
+    'sports': '⚽',
+    'beauty': '💄'
+}
+
+
+# Free-text intents, matched in a single regex pass; dict order is match priority
+_INTENT_RE = re.compile(
+    r"(?P<deal>deal|discount|sale)"
+    r"|(?P<help>help|how|what)"
+    r"|(?P<category>categor(?:y|ies))"
+    r"|(?P<region>region|country|currency)",
+    re.IGNORECASE
+)
+
+_INTENT_RESPONSES = {
+    'deal': "🔍 Looking for deals? Use /deals to see the latest offers!",
+    'help': "ℹ️ Need help? Use /help to see all available commands!",
+    'category': "🎯 Set your preferences with /category",
+    'region': "🌍 Set your region with /region"
+}
+
+# TelegramBadRequest texts that blame the deal itself (e.g. its button URL), not the chat or markup
+_DEAL_REJECTED_RE = re.compile(r"BUTTON_URL_INVALID|wrong (?:http )?url", re.IGNORECASE)
+
+_DEFAULT_RESPONSES = [
+    "👋 Hi there! Use /help to see what I can do!",
+    "🛍️ Looking for deals? Try /deals to see the latest offers!",
+    "💡 Tip: Use /category to set your preferences!"
+]
+
 
 class AffiliateBot:
     """Main Telegram bot class for Amazon affiliate deals."""
@@ -48,6 +117,29 @@ class AffiliateBot:
         self.db_manager: Optional[Union[DatabaseManager, SimpleDatabaseManager]] = None
         self.content_generator: Optional[ContentGenerator] = None
         self.scraper: Optional[DealScraper] = None
+        self.link_validator: Optional[LinkValidator] = None
+        
+        # Stay under Telegram's ~30 msg/s global bot limit
+        self._send_limiter = TokenBucket(rate=25, capacity=25)
+        
+        # Channel posts: a few in flight, spaced evenly (no bursts) within Telegram's
+        # ~20 messages/minute per channel
+        self._channel_sem = asyncio.Semaphore(5)
+        self._channel_limiter = TokenBucket(rate=20 / 60, capacity=1)
+        
+        # Short-lived cache of recent-deal queries, keyed by (hours, limit, category)
+        self._deals_cache: dict[tuple, tuple[float, list[Deal]]] = {}
+        self._deals_cache_locks: dict[tuple, asyncio.Lock] = {}
+        
+        # Extra callbacks run whenever stored deals change (e.g. web dashboard cache)
+        self.deals_changed_callbacks: list[Callable[[], None]] = []
+        
+        # Strong references to fire-and-forget tasks so they are not garbage collected
+        self._bg_tasks: set[asyncio.Task] = set()
+        
+        # /start user upserts, flushed to the database in batches (None stops the worker)
+        self._user_upsert_queue: asyncio.Queue = asyncio.Queue()
+        self._user_upsert_worker: Optional[asyncio.Task] = None
         
         # Initialize components
         self._initialize_components()
@@ -58,9 +150,18 @@ class AffiliateBot:
             raise ValueError("Bot token not configured")
         
         # Initialize bot and dispatcher
-        self.bot = Bot(token=self.config.BOT_TOKEN)
+        # One shared HTTP session for the bot's lifetime; closed once in cleanup()
+        self.bot = Bot(token=self.config.BOT_TOKEN, session=AiohttpSession(limit=TELEGRAM_CONNECTION_LIMIT))
         self.dp = Dispatcher()
         
+        # Parse admin IDs once (Config may hold a list of ints or a comma-separated string)
+        admin_ids = self.config.ADMIN_USER_IDS or []
+        if isinstance(admin_ids, str):
+            admin_ids = admin_ids.split(",")
+        self._admin_ids: frozenset[int] = frozenset(
+            int(x) for x in admin_ids if str(x).strip().isdigit()
+        )
+        
         # Initialize database manager
         if self.config.database_configured:
             self.db_manager = DatabaseManager(self.config.DATABASE_URL)
@@ -76,11 +177,63 @@ class AffiliateBot:
             request_timeout=self.config.REQUEST_TIMEOUT
         )
         
+        # Initialize link validator (shared so its connection pool stays warm)
+        self.link_validator = LinkValidator()
+        
+        # Build static keyboards once; they are reused across requests
+        self._build_keyboards()
+        
         # Register handlers
         self._register_handlers()
         
         logger.info("🤖 Bot components initialized")
     
+    def _build_keyboards(self):
+        """Build the inline keyboards that never change between requests."""
+        self._start_keyboard = InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🔥 Latest Deals", callback_data="deals:latest")],
+            [InlineKeyboardButton(text="⚙️ Settings", callback_data="settings:main")]
+        ])
+        
+        self._start_fallback_keyboard = InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="📱 Electronics", callback_data="category:electronics"),
+             InlineKeyboardButton(text="🏠 Home", callback_data="category:home")],
+            [InlineKeyboardButton(text="👕 Fashion", callback_data="category:fashion"),
+             InlineKeyboardButton(text="⚽ Sports", callback_data="category:sports")],
+            [InlineKeyboardButton(text="🛍️ All Categories", callback_data="category:all")]
+        ])
+        
+        self._category_keyboard = InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="📱 Electronics", callback_data="category:electronics"),
+             InlineKeyboardButton(text="🏠 Home & Kitchen", callback_data="category:home")],
+            [InlineKeyboardButton(text="👕 Fashion", callback_data="category:fashion"),
+             InlineKeyboardButton(text="⚽ Sports", callback_data="category:sports")],
+            [InlineKeyboardButton(text="💄 Beauty", callback_data="category:beauty"),
+             InlineKeyboardButton(text="📚 Books", callback_data="category:books")],
+            [InlineKeyboardButton(text="🔧 Tools", callback_data="category:tools"),
+             InlineKeyboardButton(text="🚗 Automotive", callback_data="category:automotive")],
+            [InlineKeyboardButton(text="🧸 Toys", callback_data="category:toys"),
+             InlineKeyboardButton(text="📋 Office", callback_data="category:office")],
+            [InlineKeyboardButton(text="🛍️ All Categories", callback_data="category:all")]
+        ])
+        
+        self._region_keyboard = InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🇺🇸 US ($)", callback_data="region:US"),
+             InlineKeyboardButton(text="🇬🇧 UK (£)", callback_data="region:UK")],
+            [InlineKeyboardButton(text="🇩🇪 DE (€)", callback_data="region:DE"),
+             InlineKeyboardButton(text="🇫🇷 FR (€)", callback_data="region:FR")],
+            [InlineKeyboardButton(text="🇨🇦 CA (CA$)", callback_data="region:CA"),
+             InlineKeyboardButton(text="🇯🇵 JP (¥)", callback_data="region:JP")],
+            [InlineKeyboardButton(text="🇦🇺 AU (AU$)", callback_data="region:AU"),
+             InlineKeyboardButton(text="🇮🇳 IN (₹)", callback_data="region:IN")]
+        ])
+        
+        self._admin_keyboard = InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="📢 Post Deals Now", callback_data="admin:post_deals")],
+            [InlineKeyboardButton(text="🧹 Clean Database", callback_data="admin:cleanup")],
+            [InlineKeyboardButton(text="📊 Full Stats", callback_data="admin:full_stats")]
+        ])
+    
     def _register_handlers(self):
         """Register message and command handlers."""
         # Command handlers
@@ -118,6 +271,11 @@ class AffiliateBot:
             await self.db_manager.initialize()
             await self.content_generator.initialize()
             await self.scraper.initialize()
+            await self.link_validator.initialize()
+            
+            # initialize() runs again from start_polling(); keep a single upsert worker
+            if self._user_upsert_worker is None or self._user_upsert_worker.done():
+                self._user_upsert_worker = self._spawn(self._flush_user_upserts())
             
             logger.info("✅ Bot services initialized successfully")
             
@@ -141,8 +299,14 @@ class AffiliateBot:
     async def cleanup(self):
         """Cleanup bot resources."""
         try:
+            # Let the upsert worker write what is queued, then wait for all background tasks
+            self._user_upsert_queue.put_nowait(None)
+            if self._bg_tasks:
+                await asyncio.gather(*self._bg_tasks, return_exceptions=True)
             if self.scraper:
                 await self.scraper.close()
+            if self.link_validator:
+                await self.link_validator.close()
             if self.content_generator:
                 await self.content_generator.close()
             if self.db_manager:
@@ -155,6 +319,47 @@ class AffiliateBot:
         except Exception as e:
             logger.error(f"Bot cleanup error: {e}")
     
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine in the background, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._on_bg_task_done)
+        return task
+    
+    def _on_bg_task_done(self, task: asyncio.Task):
+        """Release a finished background task and log its failure, if any."""
+        self._bg_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Background task failed: {task.exception()}")
+    
+    def _is_admin(self, user_id: int) -> bool:
+        """Check a user against the admin IDs parsed at startup (no IDs configured means open access)."""
+        return not self._admin_ids or user_id in self._admin_ids
+    
+    async def _flush_user_upserts(self):
+        """Write queued /start users to the database in batches until a None sentinel arrives."""
+        stopping = False
+        while True:
+            batch = [await self._user_upsert_queue.get()]
+            while len(batch) < USER_UPSERT_BATCH_SIZE and not self._user_upsert_queue.empty():
+                batch.append(self._user_upsert_queue.get_nowait())
+            
+            stopping = stopping or None in batch
+            users = [entry for entry in batch if entry is not None]
+            if users:
+                try:
+                    await self.db_manager.add_users_bulk(users)
+                except Exception as e:
+                    logger.error(f"Failed to store {len(users)} users: {e}")
+            
+            # On shutdown, keep flushing without delay until the queue is empty
+            if stopping:
+                if self._user_upsert_queue.empty():
+                    return
+                continue
+            
+            await asyncio.sleep(USER_UPSERT_FLUSH_INTERVAL)
+    
     # Command Handlers
     
     async def cmd_start(self, message: types.Message):
@@ -164,13 +369,8 @@ class AffiliateBot:
             if not user:
                 return
             
-            # Add user to database
-            await self.db_manager.add_user(
-                user_id=user.id,
-                username=user.username,
-                first_name=user.first_name,
-                last_name=user.last_name
-            )
+            # Queue user for the batched database upsert
+            self._user_upsert_queue.put_nowait((user.id, user.username, user.first_name, user.last_name))
             
             welcome_message = f"""
 🛒 *Welcome to Amazon Deal Bot!*
@@ -186,25 +386,12 @@ Hi {user.first_name or 'there'}! I help you find the best Amazon deals with inst
 Ready to save money? Use /deals to see current offers!
 """
             
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="🔥 Latest Deals", callback_data="deals:latest")],
-                [InlineKeyboardButton(text="⚙️ Settings", callback_data="settings:main")]
-            ])
-            
-            await message.reply(welcome_message, parse_mode="Markdown", reply_markup=keyboard)
+            await message.reply(welcome_message, parse_mode="Markdown", reply_markup=self._start_keyboard)
             
         except Exception as e:
             logger.error(f"Error in /start command: {e}")
             await message.reply("Welcome! Use /deals to see current Amazon offers.")
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="📱 Electronics", callback_data="category:electronics"),
-                 InlineKeyboardButton(text="🏠 Home", callback_data="category:home")],
-                [InlineKeyboardButton(text="👕 Fashion", callback_data="category:fashion"),
-                 InlineKeyboardButton(text="⚽ Sports", callback_data="category:sports")],
-                [InlineKeyboardButton(text="🛍️ All Categories", callback_data="category:all")]
-            ])
-            
-            await message.answer(welcome_msg, reply_markup=keyboard, parse_mode="Markdown")
+            await message.answer(welcome_msg, reply_markup=self._start_fallback_keyboard, parse_mode="Markdown")
             
         except Exception as e:
             logger.error(f"Error in start command: {e}")
@@ -251,76 +438,142 @@ Need help? Just ask!"""
         try:
             user_id = message.from_user.id
             
-            # Get user preferences
-            try:
-                user = await self.db_manager.get_user(user_id)
-                category_filter = user.category if user else 'all'
-            except Exception as e:
-                logger.warning(f"Error getting user preferences: {e}")
-                category_filter = 'all'
-            
-            # Get recent deals
-            recent_deals = await self.db_manager.get_recent_deals(hours=24, limit=5)
+            # Get recent deals matching the user's category preference in one query
+            recent_deals = await self.db_manager.get_deals_for_user(user_id, hours=24, limit=5)
             
             if not recent_deals:
                 await message.answer("🔍 No recent deals found. Check back soon for new deals! ⏰")
                 return
             
-            # Filter by user category if specified
-            if category_filter != 'all':
-                recent_deals = [d for d in recent_deals if d.category == category_filter]
-            
-            if not recent_deals:
-                await message.answer(f"🔍 No recent deals found for **{category_filter}** category. Check back soon! ⏰", parse_mode="Markdown")
-                return
-            
             await message.answer(f"🔥 **Latest Deals ({len(recent_deals)} found):**", parse_mode="Markdown")
             
-            # Send each deal
-            for deal in recent_deals:
-                deal_product = deal.to_product()
-                deal_message = await self.content_generator.generate_telegram_message(
-                    deal_product, deal.affiliate_link
-                )
-                
-                # Create deal keyboard
-                keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                    [InlineKeyboardButton(text="🛒 Get This Deal", url=deal.affiliate_link)],
-                    [InlineKeyboardButton(text="👍 Like", callback_data=f"deal:like:{deal.id}"),
-                     InlineKeyboardButton(text="💬 Share", callback_data=f"deal:share:{deal.id}")]
-                ])
-                
-                await message.answer(deal_message, reply_markup=keyboard, parse_mode="Markdown")
-                await asyncio.sleep(0.5)  # Avoid rate limits
+            # Send deals concurrently
+            await self._send_deals(message, recent_deals)
                 
         except Exception as e:
             logger.error(f"Error in deals command: {e}")
             await message.answer("❌ Error loading deals. Please try again later.")
     
+    async def _get_cached_recent_deals(self, hours: int = 24, limit: int = 10,
+                                       category: Optional[str] = None) -> list[Deal]:
+        """Get recent deals, reusing results younger than DEALS_CACHE_TTL."""
+        key = (hours, limit, category)
+        cached = self._deals_cache.get(key)
+        if cached and time.monotonic() - cached[0] < DEALS_CACHE_TTL:
+            return cached[1]
+        
+        # Single-flight: concurrent misses for the same key share one query
+        lock = self._deals_cache_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._deals_cache.get(key)
+            if cached and time.monotonic() - cached[0] < DEALS_CACHE_TTL:
+                return cached[1]
+            
+            deals = await self.db_manager.get_recent_deals(hours=hours, limit=limit, category=category)
+            self._deals_cache[key] = (time.monotonic(), deals)
+            return deals
+    
+    def _invalidate_deals_cache(self):
+        """Drop cached recent-deal results after new deals are stored."""
+        self._deals_cache.clear()
+        for callback in self.deals_changed_callbacks:
+            callback()
+    
+    def _deal_keyboard(self, deal: Deal) -> InlineKeyboardMarkup:
+        """Build the inline keyboard attached to a deal message."""
+        return InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text="🛒 Get This Deal", url=deal.affiliate_link)],
+            [InlineKeyboardButton(text="👍 Like", callback_data=f"deal:like:{deal.id}"),
+             InlineKeyboardButton(text="💬 Share", callback_data=f"deal:share:{deal.id}")]
+        ])
+    
+    async def _render_deal_messages(self, deals: list[Deal]) -> list[str]:
+        """Generate Telegram messages for deals concurrently."""
+        return await asyncio.gather(*(
+            self.content_generator.generate_deal_message(deal.id, deal.product, deal.affiliate_link)
+            for deal in deals
+        ))
+    
+    async def _send_deals(self, message: types.Message, deals: list[Deal],
+                          deal_messages: Optional[list[str]] = None, max_concurrent: int = 3):
+        """Send deal messages concurrently, bounded by a semaphore and the bot rate limit."""
+        if deal_messages is None:
+            deal_messages = await self._render_deal_messages(deals)
+        
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        # Build keyboards up front so only I/O overlaps
+        keyboards = [self._deal_keyboard(deal) for deal in deals]
+        
+        chat_id = message.chat.id
+        
+        async def _send(deal_message: str, keyboard: InlineKeyboardMarkup):
+            async with semaphore:
+                await self._send_limiter.acquire()
+                return await self.bot(SendMessage(
+                    chat_id=chat_id, text=deal_message, reply_markup=keyboard, parse_mode="Markdown"
+                ))
+        
+        results = await asyncio.gather(
+            *(_send(deal_message, keyboard) for deal_message, keyboard in zip(deal_messages, keyboards)),
+            return_exceptions=True
+        )
+        
+        for deal, result in zip(deals, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to send deal {deal.id}: {result}")
+    
+    async def _send_deal_media_group(self, message: types.Message, deals: list[Deal],
+                                     deal_messages: list[str]) -> bool:
+        """Send deals as one photo album plus a summary keyboard; returns False if nothing was sent."""
+        media = [
+            InputMediaPhoto(media=deal.image_url, caption=deal_message, parse_mode="Markdown")
+            for deal, deal_message in zip(deals, deal_messages)
+        ]
+        
+        try:
+            await self._send_limiter.acquire()
+            await message.answer_media_group(media)
+        except Exception as e:
+            logger.warning(f"Failed to send deal media group: {e}")
+            return False
+        
+        # Albums cannot carry inline keyboards, so follow up with one button per deal
+        keyboard = InlineKeyboardMarkup(inline_keyboard=[
+            [InlineKeyboardButton(text=f"🛒 Get Deal {i}", url=deal.affiliate_link)]
+            for i, deal in enumerate(deals, 1)
+        ])
+        try:
+            await self._send_limiter.acquire()
+            await message.answer("👆 Tap a button to open a deal:", reply_markup=keyboard)
+        except Exception as e:
+            logger.warning(f"Failed to send deal media group keyboard: {e}")
+        return True
+    
     async def _get_category_deals(self, message: types.Message, category: str, category_emoji: str):
         """Helper method to get deals for a specific category with link validation."""
         try:
-            from link_validator import LinkValidator
-            
-            recent_deals = await self.db_manager.get_recent_deals(hours=24, limit=10)
-            
-            # Filter by category
-            category_deals = [d for d in recent_deals if d.category == category]
+            # Category filtering happens in the database query
+            category_deals = await self._get_cached_recent_deals(hours=24, limit=10, category=category)
             
             if not category_deals:
                 await message.answer(f"{category_emoji} No recent {category} deals found. Check back soon!")
                 return
             
-            # Validate links before sending to user
-            async with LinkValidator() as validator:
-                affiliate_links = [deal.affiliate_link for deal in category_deals]
-                validation_results = await validator.validate_links_batch(affiliate_links)
-                
-                # Filter to only valid deals
-                valid_deals = []
-                for deal, result in zip(category_deals, validation_results):
-                    if result.is_valid:
-                        valid_deals.append(deal)
+            # Validate links while deal messages are generated
+            affiliate_links = [deal.affiliate_link for deal in category_deals]
+            deal_messages, validation_results = await asyncio.gather(
+                self._render_deal_messages(category_deals),
+                self.link_validator.validate_links_batch(affiliate_links)
+            )
+            
+            # Filter to only valid deals
+            valid_deals = []
+            valid_messages = []
+            for deal, deal_message, result in zip(category_deals, deal_messages, validation_results):
+                if result.is_valid:
+                    valid_deals.append(deal)
+                    valid_messages.append(deal_message)
             
             if not valid_deals:
                 await message.answer(f"{category_emoji} No valid {category} deals available right now. Please try again later!")
@@ -328,21 +581,25 @@ Need help? Just ask!"""
             
             await message.answer(f"{category_emoji} *{category.title()} Deals ({len(valid_deals)} verified):*", parse_mode="Markdown")
             
-            # Send each validated deal
-            for deal in valid_deals:
-                deal_product = deal.to_product()
-                deal_message = await self.content_generator.generate_telegram_message(
-                    deal_product, deal.affiliate_link
-                )
-                
-                keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                    [InlineKeyboardButton(text="🛒 Get This Deal", url=deal.affiliate_link)],
-                    [InlineKeyboardButton(text="👍 Like", callback_data=f"deal:like:{deal.id}"),
-                     InlineKeyboardButton(text="💬 Share", callback_data=f"deal:share:{deal.id}")]
-                ])
-                
-                await message.answer(deal_message, reply_markup=keyboard, parse_mode="Markdown")
-                await asyncio.sleep(0.5)
+            # Deals with images go out as a single album; the rest are sent individually
+            album = [
+                (deal, deal_message) for deal, deal_message in zip(valid_deals, valid_messages)
+                if deal.image_url and len(deal_message) <= MEDIA_CAPTION_MAX_LENGTH
+            ][:MEDIA_GROUP_MAX_ITEMS]
+            if len(album) >= 2:
+                album_deals, album_messages = map(list, zip(*album))
+                if await self._send_deal_media_group(message, album_deals, album_messages):
+                    album_ids = {id(deal) for deal in album_deals}
+                    remaining = [
+                        (deal, deal_message) for deal, deal_message in zip(valid_deals, valid_messages)
+                        if id(deal) not in album_ids
+                    ]
+                    valid_deals = [deal for deal, _ in remaining]
+                    valid_messages = [deal_message for _, deal_message in remaining]
+            
+            # Send remaining validated deals concurrently
+            if valid_deals:
+                await self._send_deals(message, valid_deals, valid_messages)
                 
         except Exception as e:
             logger.error(f"Error in {category} deals command: {e}")
@@ -374,23 +631,9 @@ Need help? Just ask!"""
     
     async def cmd_category(self, message: types.Message):
         """Handle /category command."""
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="📱 Electronics", callback_data="category:electronics"),
-             InlineKeyboardButton(text="🏠 Home & Kitchen", callback_data="category:home")],
-            [InlineKeyboardButton(text="👕 Fashion", callback_data="category:fashion"),
-             InlineKeyboardButton(text="⚽ Sports", callback_data="category:sports")],
-            [InlineKeyboardButton(text="💄 Beauty", callback_data="category:beauty"),
-             InlineKeyboardButton(text="📚 Books", callback_data="category:books")],
-            [InlineKeyboardButton(text="🔧 Tools", callback_data="category:tools"),
-             InlineKeyboardButton(text="🚗 Automotive", callback_data="category:automotive")],
-            [InlineKeyboardButton(text="🧸 Toys", callback_data="category:toys"),
-             InlineKeyboardButton(text="📋 Office", callback_data="category:office")],
-            [InlineKeyboardButton(text="🛍️ All Categories", callback_data="category:all")]
-        ])
-        
         await message.answer(
             "🎯 **Choose your preferred category:**\n\nI'll send you deals that match your interests!",
-            reply_markup=keyboard,
+            reply_markup=self._category_keyboard,
             parse_mode="Markdown"
         )
     
@@ -417,18 +660,7 @@ Current: **{current_region}** ({currency_info['symbol']} {currency_info['code']}
 Select your preferred Amazon marketplace to get deals with correct pricing and links:
 """.strip()
             
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="🇺🇸 US ($)", callback_data="region:US"),
-                 InlineKeyboardButton(text="🇬🇧 UK (£)", callback_data="region:UK")],
-                [InlineKeyboardButton(text="🇩🇪 DE (€)", callback_data="region:DE"),
-                 InlineKeyboardButton(text="🇫🇷 FR (€)", callback_data="region:FR")],
-                [InlineKeyboardButton(text="🇨🇦 CA (CA$)", callback_data="region:CA"),
-                 InlineKeyboardButton(text="🇯🇵 JP (¥)", callback_data="region:JP")],
-                [InlineKeyboardButton(text="🇦🇺 AU (AU$)", callback_data="region:AU"),
-                 InlineKeyboardButton(text="🇮🇳 IN (₹)", callback_data="region:IN")]
-            ])
-            
-            await message.answer(region_text, reply_markup=keyboard, parse_mode="Markdown")
+            await message.answer(region_text, reply_markup=self._region_keyboard, parse_mode="Markdown")
             
         except Exception as e:
             logger.error(f"Error in region command: {e}")
@@ -464,7 +696,7 @@ Select your preferred Amazon marketplace to get deals with correct pricing and l
             if stats.category_stats:
                 sorted_categories = sorted(stats.category_stats.items(), key=lambda x: x[1], reverse=True)
                 for category, count in sorted_categories[:5]:
-                    emoji = {'electronics': '📱', 'home': '🏠', 'fashion': '👕', 'sports': '⚽', 'beauty': '💄'}.get(category, '🛍️')
+                    emoji = CATEGORY_EMOJIS.get(category, '🛍️')
                     stats_text += f"\n{emoji} {category.title()}: {count}"
             else:
                 stats_text += "\nNo category data available yet."
@@ -477,11 +709,7 @@ Select your preferred Amazon marketplace to get deals with correct pricing and l
     
     async def cmd_admin(self, message: types.Message):
         """Handle /admin command (admin only)."""
-        # Simple admin check - in production, use proper admin verification
-        user_id = message.from_user.id
-        admin_ids = [int(x) for x in str(self.config.ADMIN_USER_IDS or "").split(",") if x.isdigit()]
-        
-        if admin_ids and user_id not in admin_ids:
+        if not self._is_admin(message.from_user.id):
             await message.answer("❌ Access denied. Admin only.")
             return
         
@@ -499,16 +727,14 @@ Select your preferred Amazon marketplace to get deals with correct pricing and l
 • View logs
 """.strip()
         
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-            [InlineKeyboardButton(text="📢 Post Deals Now", callback_data="admin:post_deals")],
-            [InlineKeyboardButton(text="🧹 Clean Database", callback_data="admin:cleanup")],
-            [InlineKeyboardButton(text="📊 Full Stats", callback_data="admin:full_stats")]
-        ])
-        
-        await message.answer(admin_text, reply_markup=keyboard, parse_mode="Markdown")
+        await message.answer(admin_text, reply_markup=self._admin_keyboard, parse_mode="Markdown")
     
     async def cmd_add_deal(self, message: types.Message):
-        """Handle /add_deal command."""
+        """Handle /add_deal command (admin only)."""
+        if not self._is_admin(message.from_user.id):
+            await message.answer("❌ Access denied. Admin only.")
+            return
+        
         # Extract URL from message
         text_parts = message.text.split(maxsplit=1)
         if len(text_parts) < 2:
@@ -526,12 +752,10 @@ Select your preferred Amazon marketplace to get deals with correct pricing and l
                 return
             
             # Validate the link before adding
-            from link_validator import LinkValidator
-            async with LinkValidator() as validator:
-                result = await validator.validate_link(url)
-                if not result.is_valid:
-                    await message.answer(f"❌ Invalid or broken link: {result.error_message}")
-                    return
+            result = await self.link_validator.validate_link(url)
+            if not result.is_valid:
+                await message.answer(f"❌ Invalid or broken link: {result.error_message}")
+                return
             
             # Generate affiliate link
             affiliate_link = self.config.get_affiliate_link(url)
@@ -543,6 +767,7 @@ Select your preferred Amazon marketplace to get deals with correct pricing and l
                 source="manual",
                 content_style="simple"
             )
+            self._invalidate_deals_cache()
             
             await message.answer(f"✅ Deal added successfully!\n\n**{product.title}**\nPrice: {product.price}\nDeal ID: {deal.id}")
             
@@ -552,11 +777,7 @@ Select your preferred Amazon marketplace to get deals with correct pricing and l
     
     async def cmd_broadcast(self, message: types.Message):
         """Handle /broadcast command (admin only)."""
-        # Simple admin check
-        user_id = message.from_user.id
-        admin_ids = [int(x) for x in str(self.config.ADMIN_USER_IDS or "").split(",") if x.isdigit()]
-        
-        if admin_ids and user_id not in admin_ids:
+        if not self._is_admin(message.from_user.id):
             await message.answer("❌ Access denied. Admin only.")
             return
         
@@ -569,25 +790,46 @@ Select your preferred Amazon marketplace to get deals with correct pricing and l
         broadcast_message = text_parts[1].strip()
         
         try:
-            # Get all active users
-            users = await self.db_manager.get_active_users(days=30)
-            
             sent_count = 0
             failed_count = 0
+            semaphore = asyncio.Semaphore(20)
+            text = f"📢 **Broadcast Message**\n\n{broadcast_message}"
             
-            for user in users:
+            # Render once in the log chat (if configured) and copy it to each user
+            source_message = None
+            if self.config.LOG_CHAT_ID:
                 try:
-                    await self.bot.send_message(
-                        chat_id=user.user_id,
-                        text=f"📢 **Broadcast Message**\n\n{broadcast_message}",
+                    source_message = await self.bot.send_message(
+                        chat_id=self.config.LOG_CHAT_ID,
+                        text=text,
                         parse_mode="Markdown"
                     )
-                    sent_count += 1
-                    await asyncio.sleep(0.1)  # Rate limiting
-                    
                 except Exception as e:
-                    logger.warning(f"Failed to send broadcast to user {user.user_id}: {e}")
-                    failed_count += 1
+                    logger.warning(f"Failed to post broadcast to log chat, sending directly: {e}")
+            
+            # Invariant method arguments, built once; only chat_id changes per user
+            if source_message:
+                method_cls = CopyMessage
+                method_kwargs = dict(from_chat_id=self.config.LOG_CHAT_ID, message_id=source_message.message_id)
+            else:
+                method_cls = SendMessage
+                method_kwargs = dict(text=text, parse_mode="Markdown")
+            
+            async def _send(user_id: int) -> bool:
+                async with semaphore:
+                    await self._send_limiter.acquire()  # Rate limiting
+                    try:
+                        await self.bot(method_cls(chat_id=user_id, **method_kwargs))
+                        return True
+                    except Exception as e:
+                        logger.warning(f"Failed to send broadcast to user {user_id}: {e}")
+                        return False
+            
+            # Stream active users page by page so sending starts before the whole table is read
+            async for chunk in self.db_manager.iter_active_user_ids(days=30, page_size=500):
+                results = await asyncio.gather(*(_send(user_id) for user_id in chunk))
+                sent_count += sum(results)
+                failed_count += len(results) - sum(results)
             
             await message.answer(f"✅ Broadcast sent!\n\n📤 Sent: {sent_count}\n❌ Failed: {failed_count}")
             
@@ -669,29 +911,46 @@ Select your preferred Amazon marketplace to get deals with correct pricing and l
     
     async def handle_text_message(self, message: types.Message):
         """Handle regular text messages."""
-        text = message.text.lower()
-        
         # Simple command recognition
-        if any(word in text for word in ['deal', 'deals', 'discount', 'sale']):
-            await message.answer("🔍 Looking for deals? Use /deals to see the latest offers!")
-        elif any(word in text for word in ['help', 'how', 'what']):
-            await message.answer("ℹ️ Need help? Use /help to see all available commands!")
-        elif any(word in text for word in ['category', 'categories']):
-            await message.answer("🎯 Set your preferences with /category")
-        elif any(word in text for word in ['region', 'country', 'currency']):
-            await message.answer("🌍 Set your region with /region")
+        matched = {match.lastgroup for match in _INTENT_RE.finditer(message.text)}
+        intent = next((name for name in _INTENT_RESPONSES if name in matched), None)
+        
+        if intent:
+            await message.answer(_INTENT_RESPONSES[intent])
         else:
             # Default response
-            responses = [
-                "👋 Hi there! Use /help to see what I can do!",
-                "🛍️ Looking for deals? Try /deals to see the latest offers!",
-                "💡 Tip: Use /category to set your preferences!"
-            ]
-            import random
-            await message.answer(random.choice(responses))
+            await message.answer(random.choice(_DEFAULT_RESPONSES))
     
     # Utility methods
     
+    async def _post_to_channel(self, text: str, keyboard: InlineKeyboardMarkup, max_attempts: int = 3):
+        """Post a message to the deals channel, backing off on rate limits and transient errors.
+        
+        Permanent errors (e.g. TelegramBadRequest) are raised immediately.
+        """
+        method = SendMessage(
+            chat_id=self.config.TELEGRAM_CHANNEL,
+            text=text,
+            reply_markup=keyboard,
+            parse_mode="Markdown"
+        )
+        async with self._channel_sem:
+            for attempt in range(1, max_attempts + 1):
+                await self._channel_limiter.acquire()
+                try:
+                    return await self.bot(method)
+                except TelegramRetryAfter as e:
+                    if attempt == max_attempts:
+                        raise
+                    delay = e.retry_after
+                    logger.warning(f"Channel post rate limited, retrying in {delay}s")
+                except (TelegramNetworkError, TelegramServerError) as e:
+                    if attempt == max_attempts:
+                        raise
+                    delay = 2 ** (attempt - 1)
+                    logger.warning(f"Channel post failed ({e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+    
     async def post_deals(self) -> int:
         """Post new deals (called by scheduler)."""
         try:
@@ -702,53 +961,72 @@ Select your preferred Amazon marketplace to get deals with correct pricing and l
                 logger.info("ℹ️ No new deals found")
                 return 0
             
+            # Drop deals that already exist, with one lookup for the whole batch
+            existing_asins = await self.db_manager.get_existing_asins([product.asin for product in deals])
+            deals = [product for product in deals if product.asin not in existing_asins]
+            
+            # Enrich every deal before posting: links are local, content generation runs concurrently
+            affiliate_links = [self.config.get_affiliate_link(product.link) for product in deals]
+            messages = await asyncio.gather(*(
+                self.content_generator.generate_telegram_message(product, affiliate_link)
+                for product, affiliate_link in zip(deals, affiliate_links)
+            ), return_exceptions=True)
+            
+            # Posted deals waiting to be saved; flushed every DEAL_SAVE_BATCH_SIZE posts and on exit
+            pending: list[tuple] = []
             posted_count = 0
             
-            for product in deals:
+            async def _save_pending():
+                batch = pending[:]
+                pending.clear()
+                if not batch:
+                    return
                 try:
-                    # Check if deal already exists
-                    existing = await self.db_manager.get_deal_by_asin(product.asin)
-                    if existing:
-                        continue
-                    
-                    # Generate affiliate link
-                    affiliate_link = self.config.get_affiliate_link(product.link)
-                    
-                    # Generate content
-                    message = await self.content_generator.generate_telegram_message(
-                        product, affiliate_link
-                    )
+                    await self.db_manager.add_deals_bulk(batch)
+                except Exception as e:
+                    logger.error(f"Error saving {len(batch)} posted deals: {e}")
+            
+            async def _process(product, affiliate_link: str, message):
+                nonlocal posted_count
+                try:
+                    if isinstance(message, Exception):
+                        raise message
                     
                     # Post to channel if configured
                     if self.config.TELEGRAM_CHANNEL:
                         keyboard = InlineKeyboardMarkup(inline_keyboard=[
                             [InlineKeyboardButton(text="🛒 Get This Deal", url=affiliate_link)]
                         ])
-                        
-                        await self.bot.send_message(
-                            chat_id=self.config.TELEGRAM_CHANNEL,
-                            text=message,
-                            reply_markup=keyboard,
-                            parse_mode="Markdown"
-                        )
-                    
-                    # Save to database
-                    await self.db_manager.add_deal(
-                        product=product,
-                        affiliate_link=affiliate_link,
-                        source="scraper",
-                        content_style="enthusiastic"
-                    )
+                        await self._post_to_channel(message, keyboard)
                     
-                    posted_count += 1
                     logger.info(f"✅ Posted deal: {product.title[:50]}...")
+                    posted_count += 1
+                    pending.append((product, affiliate_link, "scraper", "enthusiastic"))
+                    if len(pending) >= DEAL_SAVE_BATCH_SIZE:
+                        await _save_pending()
                     
-                    # Rate limiting
-                    await asyncio.sleep(2)
+                except TelegramBadRequest as e:
+                    logger.error(f"Telegram rejected deal {product.title}: {e}")
+                    # Only errors about the deal's own content will repeat; skip its ASIN for a while
+                    if product.asin and _DEAL_REJECTED_RE.search(str(e)):
+                        try:
+                            await self.db_manager.mark_asin_poisoned(product.asin, str(e))
+                        except Exception as db_error:
+                            logger.error(f"Error marking ASIN {product.asin} as poisoned: {db_error}")
                     
                 except Exception as e:
                     logger.error(f"Error posting deal {product.title}: {e}")
-                    continue
+            
+            try:
+                await asyncio.gather(*(
+                    _process(product, affiliate_link, message)
+                    for product, affiliate_link, message in zip(deals, affiliate_links, messages)
+                ))
+            finally:
+                # Also runs when the run is cancelled, so deals already in the channel are recorded
+                await _save_pending()
+                if posted_count:
+                    self._invalidate_deals_cache()
             
             logger.info(f"📢 Posted {posted_count} new deals")
             return posted_count
@@ -3,27 +3,46 @@ Production Web Dashboard for Amazon Affiliate Deal Bot.
 Real-time data with zero demo/mock content - Academic level implementation.
 """
 import os
+import json
+import shutil
 import logging
 import asyncio
+import concurrent.futures
 import threading
+import time
+import traceback
 from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify
+from functools import wraps
+from operator import attrgetter
+from flask import Flask, current_app, render_template, request
 from config import Config
 from database import DatabaseManager
 from database_simple import SimpleDatabaseManager
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
 class AsyncDataManager:
     """Async data manager with sync wrapper for Flask."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, stats_snapshot_interval: int = 30):
         self.config = config
         self.db_manager = None
+        self.stats_snapshot_interval = stats_snapshot_interval
+        # Latest _collect_stats() result, refreshed in the background; None until the first run
+        self.stats_snapshot = None
+        # Bumped by invalidate_stats() so a refresh started before a change is discarded
+        self._stats_generation = 0
         self._loop = None
         self._thread = None
         self._initialized = False
+        self._ready = threading.Event()
         
     def start(self):
         """Start async event loop in separate thread."""
@@ -33,12 +52,11 @@ class AsyncDataManager:
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
         
-        # Wait for initialization
-        import time
-        timeout = 10
-        start_time = time.time()
-        while not self._initialized and time.time() - start_time < timeout:
-            time.sleep(0.1)
+        # Wait for the loop thread to finish initializing (or fail)
+        if not self._ready.wait(timeout=10):
+            logger.error("Dashboard database initialization timed out after 10s")
+        elif not self._initialized:
+            logger.error("Dashboard database unavailable; API endpoints will report degraded data")
         
     def _run_loop(self):
         """Run async event loop."""
@@ -49,7 +67,6 @@ class AsyncDataManager:
             # Initialize database manager - prefer PostgreSQL if available
             if hasattr(self.config, 'DATABASE_URL') and self.config.DATABASE_URL:
                 try:
-                    from database import DatabaseManager
                     self.db_manager = DatabaseManager(self.config.DATABASE_URL)
                     logger.info("📊 Dashboard using PostgreSQL database")
                 except Exception as e:
@@ -62,26 +79,225 @@ class AsyncDataManager:
             # Initialize in the loop
             self._loop.run_until_complete(self.db_manager.initialize())
             self._initialized = True
+            self._ready.set()
+            
+            self._loop.create_task(self._stats_snapshot_worker())
             
             # Keep loop running
             self._loop.run_forever()
         except Exception as e:
             logger.error(f"Error in async loop: {e}")
-            self._initialized = True
+            # The loop is not running, so leave _initialized unset and let execute_async return None
+            self._ready.set()
         
-    def execute_async(self, coro):
-        """Execute async coroutine and return result."""
+    async def _stats_snapshot_worker(self):
+        """Refresh the stats snapshot periodically so /api/stats needs no database hop."""
+        while True:
+            generation = self._stats_generation
+            try:
+                snapshot = await _collect_stats(self.db_manager)
+            except Exception as e:
+                logger.error(f"Stats snapshot refresh failed: {e}")
+            else:
+                if generation != self._stats_generation:
+                    # Deals changed while this refresh was running; redo it right away
+                    continue
+                self.stats_snapshot = snapshot
+            await asyncio.sleep(self.stats_snapshot_interval)
+    
+    def invalidate_stats(self):
+        """Drop the stats snapshot so the next request reads live data (called when deals change)."""
+        self._stats_generation += 1
+        self.stats_snapshot = None
+    
+    def execute_async(self, coro, timeout: float = 10):
+        """Execute async coroutine on the shared loop and return result."""
         if not self._loop or not self._initialized:
+            coro.close()
             return None
             
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
         try:
-            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
-            return future.result(timeout=10)
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            # Don't leave abandoned queries running on the shared loop
+            future.cancel()
+            logger.error(f"Async execution timed out after {timeout}s")
+            return None
         except Exception as e:
             logger.error(f"Async execution error: {e}")
             return None
 
 
+class ResponseCache:
+    """Thread-safe TTL cache for API response bodies, shared by Flask worker threads."""
+    
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        # Bumped by clear() so responses computed before a change are not stored
+        self.generation = 0
+    
+    def get(self, key):
+        """Return a cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+    
+    def set(self, key, value, ttl: float, generation: int = None):
+        """Store a value for `ttl` seconds, unless clear() ran since `generation` was read."""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key not in self._entries and len(self._entries) >= self.maxsize:
+                evicted = next(iter(self._entries))
+                del self._entries[evicted]
+                self._key_locks.pop(evicted, None)
+            self._entries[key] = (time.monotonic() + ttl, value)
+    
+    def key_lock(self, key) -> threading.Lock:
+        """Lock that lets concurrent misses on one key wait for a single computation."""
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+    
+    def clear(self):
+        """Drop all cached responses (called when deals change)."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._key_locks.clear()
+
+
+def cached_response(cache: ResponseCache, ttl: float):
+    """Cache successful JSON responses of a route by path and query string."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request.full_path
+            cached = cache.get(key)
+            if cached is None:
+                # Single-flight: concurrent misses wait for the first request to fill the cache
+                with cache.key_lock(key):
+                    cached = cache.get(key)
+                    if cached is None:
+                        generation = cache.generation
+                        response = current_app.make_response(view(*args, **kwargs))
+                        if response.status_code == 200:
+                            cache.set(key, response.get_data(), ttl, generation)
+                        response.headers['X-Cache'] = 'MISS'
+                        return response
+            
+            response = current_app.response_class(cached, mimetype='application/json')
+            response.headers['X-Cache'] = 'HIT'
+            return response
+        return wrapper
+    return decorator
+
+
+def _json_default(value):
+    """Serialize datetimes the same way orjson does (ISO 8601)."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _ojsonify(payload):
+    """Build a JSON response, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        body = orjson.dumps(payload)
+    else:
+        body = json.dumps(payload, default=_json_default, separators=(',', ':'))
+    return current_app.response_class(body, mimetype='application/json')
+
+# Zeroed /api/stats payload, encoded once; error responses only append the message and timestamp
+_EMPTY_STATS_PREFIX = json.dumps({
+    'total_deals': 0,
+    'recent_deals': 0,
+    'total_clicks': 0,
+    'total_conversions': 0,
+    'total_earnings': 0.0,
+    'active_users': 0,
+    'conversion_rate': 0.0,
+    'avg_earnings_per_deal': 0.0,
+    'avg_earnings_per_click': 0.0,
+    'category_stats': {},
+    'source_stats': {}
+}, separators=(',', ':'))[:-1].encode()
+
+_EMPTY_LIST_JSON = b'[]'
+
+def _empty_stats_response(error: str):
+    """Zeroed stats response carrying an error message."""
+    body = b''.join((
+        _EMPTY_STATS_PREFIX,
+        b',"error":', json.dumps(error).encode(),
+        b',"timestamp":"', datetime.now().isoformat().encode(), b'"}'
+    ))
+    return current_app.response_class(body, mimetype='application/json')
+
+def _empty_list_response():
+    """Empty JSON list response for the deals and users endpoints."""
+    return current_app.response_class(_EMPTY_LIST_JSON, mimetype='application/json')
+
+# /api/deals and /api/users row layouts: (field, value used when the column is NULL)
+_DEAL_API_FIELDS = (
+    ('id', None),
+    ('title', ''),
+    ('price', ''),
+    ('discount', ''),
+    ('category', ''),
+    ('source', ''),
+    ('asin', ''),
+    ('clicks', 0),
+    ('conversions', 0),
+    ('earnings', 0.0),
+    ('posted_at', None),
+    ('affiliate_link', ''),
+    ('rating', 0.0),
+    ('review_count', 0),
+    ('is_active', True)
+)
+
+_USER_API_FIELDS = (
+    ('id', None),
+    ('user_id', 0),
+    ('username', None),
+    ('first_name', None),
+    ('last_name', None),
+    ('category', 'all'),
+    ('region', 'US'),
+    ('total_clicks', 0),
+    ('total_conversions', 0),
+    ('total_earnings', 0.0),
+    ('joined_at', None),
+    ('last_seen', None),
+    ('is_active', True)
+)
+
+def _row_serializer(fields):
+    """Build a row -> dict converter that reads all fields with one attrgetter call."""
+    names = tuple(name for name, _ in fields)
+    defaults = tuple(default for _, default in fields)
+    get_values = attrgetter(*names)
+    
+    def serialize(row):
+        values = get_values(row)
+        return dict(zip(names, [default if value is None else value
+                                for value, default in zip(values, defaults)]))
+    return serialize
+
+# Deal/User rows are already typed (DECIMAL columns become float in the DB layer),
+# so only NULLs need replacing
+_serialize_deal = _row_serializer(_DEAL_API_FIELDS)
+_serialize_user = _row_serializer(_USER_API_FIELDS)
+
 def safe_int(value, default=0):
     """Safely convert value to int."""
     if value is None:
@@ -91,14 +307,26 @@ def safe_int(value, default=0):
     except (ValueError, TypeError):
         return default
 
-def safe_float(value, default=0.0):
-    """Safely convert value to float."""
-    if value is None:
-        return default
+async def _collect_stats(db_manager):
+    """Load deal stats, running the count fallbacks only for counts that came back empty.
+    
+    Returns (stats, recent_total, active_total); failures are returned, not raised, and
+    a fallback that was not needed is None.
+    """
     try:
-        return float(value)
-    except (ValueError, TypeError):
-        return default
+        stats = await db_manager.get_deal_stats()
+    except Exception as e:
+        stats = e
+    
+    have_stats = stats and not isinstance(stats, Exception)
+    fallbacks = {}
+    if not have_stats or not stats.recent_deals:
+        fallbacks['recent'] = db_manager.count_recent_deals(hours=24)
+    if not have_stats or not stats.active_users:
+        fallbacks['active'] = db_manager.count_active_users(days=30)
+    
+    counts = dict(zip(fallbacks, await asyncio.gather(*fallbacks.values(), return_exceptions=True)))
+    return stats, counts.get('recent'), counts.get('active')
 
 def create_app(config: Config):
     """Create production Flask application."""
@@ -112,6 +340,10 @@ def create_app(config: Config):
     # Store data manager reference
     setattr(app, 'data_manager', data_manager)
     
+    # Short-lived cache for polled API endpoints
+    api_cache = ResponseCache()
+    setattr(app, 'api_cache', api_cache)
+    
     @app.route('/')
     def dashboard():
         """Main dashboard interface."""
@@ -128,26 +360,13 @@ def create_app(config: Config):
         return render_template('users.html')
     
     @app.route('/api/stats')
+    @cached_response(api_cache, ttl=10)
     def api_stats():
         """Real-time statistics API endpoint - ONLY REAL DATA with proper error handling."""
         try:
             data_manager = getattr(app, 'data_manager', None)
             if not data_manager or not data_manager.db_manager:
-                return jsonify({
-                    'error': 'Database not available',
-                    'total_deals': 0,
-                    'recent_deals': 0,
-                    'total_clicks': 0,
-                    'total_conversions': 0,
-                    'total_earnings': 0.0,
-                    'active_users': 0,
-                    'conversion_rate': 0.0,
-                    'avg_earnings_per_deal': 0.0,
-                    'avg_earnings_per_click': 0.0,
-                    'category_stats': {},
-                    'source_stats': {},
-                    'timestamp': datetime.now().isoformat()
-                }), 200  # Return 200 instead of 503 to prevent frontend errors
+                return _empty_stats_response('Database not available')  # 200 instead of 503 to prevent frontend errors
             
             # Initialize default values
             total_deals = 0
@@ -159,53 +378,39 @@ def create_app(config: Config):
             category_stats = {}
             source_stats = {}
             
-            # Get real stats from database with comprehensive error handling
+            # Use the background snapshot; query live (in one round trip) only until it exists
+            results = data_manager.stats_snapshot or data_manager.execute_async(_collect_stats(data_manager.db_manager))
+            stats, recent_total, active_total = results or (None, None, None)
+            
             try:
-                stats = data_manager.execute_async(data_manager.db_manager.get_deal_stats())
+                if isinstance(stats, Exception):
+                    raise stats
                 if stats:
-                    total_deals = safe_int(getattr(stats, 'total_deals', 0))
-                    total_clicks = safe_int(getattr(stats, 'total_clicks', 0))
-                    total_conversions = safe_int(getattr(stats, 'total_conversions', 0))
-                    total_earnings = safe_float(getattr(stats, 'total_earnings', 0.0))
-                    recent_count = safe_int(getattr(stats, 'recent_deals', 0))
-                    active_count = safe_int(getattr(stats, 'active_users', 0))
-                    
-                    # Safely get category and source stats
-                    category_stats = getattr(stats, 'category_stats', {}) or {}
-                    source_stats = getattr(stats, 'source_stats', {}) or {}
-                    # Ensure they are dictionaries
-                    if not isinstance(category_stats, dict):
-                        category_stats = {}
-                    if not isinstance(source_stats, dict):
-                        source_stats = {}
-                    # Clean up None values in stats dicts
-                    category_stats = {str(k): int(v) if v is not None else 0 for k, v in category_stats.items()}
-                    source_stats = {str(k): int(v) if v is not None else 0 for k, v in source_stats.items()}
-                        
+                    # DealStats is fully typed by both database managers (str keys, int counts)
+                    total_deals = stats.total_deals
+                    total_clicks = stats.total_clicks
+                    total_conversions = stats.total_conversions
+                    total_earnings = stats.total_earnings
+                    recent_count = stats.recent_deals
+                    active_count = stats.active_users
+                    category_stats = stats.category_stats
+                    source_stats = stats.source_stats
+            
             except Exception as e:
                 logger.error(f"Error getting deal stats: {e}")
-                import traceback
                 logger.error(f"Stats traceback: {traceback.format_exc()}")
             
-            # Get recent deals count with error handling (fallback if not in stats)
-            if recent_count == 0:
-                try:
-                    recent_deals = data_manager.execute_async(
-                        data_manager.db_manager.get_recent_deals(hours=24, limit=100)
-                    )
-                    recent_count = len(recent_deals) if recent_deals else 0
-                except Exception as e:
-                    logger.error(f"Error getting recent deals: {e}")
+            # Recent deals count (fallback if not in stats)
+            if isinstance(recent_total, Exception):
+                logger.error(f"Error counting recent deals: {recent_total}")
+            elif recent_count == 0:
+                recent_count = safe_int(recent_total)
             
-            # Get active users count with error handling (fallback if not in stats)
-            if active_count == 0:
-                try:
-                    active_users = data_manager.execute_async(
-                        data_manager.db_manager.get_active_users(days=30)
-                    )
-                    active_count = len(active_users) if active_users else 0
-                except Exception as e:
-                    logger.error(f"Error getting active users: {e}")
+            # Active users count (fallback if not in stats)
+            if isinstance(active_total, Exception):
+                logger.error(f"Error counting active users: {active_total}")
+            elif active_count == 0:
+                active_count = safe_int(active_total)
             
             # Calculate conversion rate safely
             conversion_rate = 0.0
@@ -222,7 +427,7 @@ def create_app(config: Config):
             if total_clicks > 0:
                 avg_earnings_per_click = total_earnings / total_clicks
             
-            return jsonify({
+            return _ojsonify({
                 'total_deals': total_deals,
                 'recent_deals': recent_count,
                 'total_clicks': total_clicks,
@@ -234,32 +439,18 @@ def create_app(config: Config):
                 'avg_earnings_per_click': round(avg_earnings_per_click, 4),
                 'category_stats': category_stats,
                 'source_stats': source_stats,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': datetime.now()
             })
             
         except Exception as e:
             logger.error(f"Stats API error: {e}")
-            import traceback
             logger.error(f"Stats API traceback: {traceback.format_exc()}")
             
             # Return safe default stats with 200 status
-            return jsonify({
-                'error': 'Statistics temporarily unavailable',
-                'total_deals': 0,
-                'recent_deals': 0,
-                'total_clicks': 0,
-                'total_conversions': 0,
-                'total_earnings': 0.0,
-                'active_users': 0,
-                'conversion_rate': 0.0,
-                'avg_earnings_per_deal': 0.0,
-                'avg_earnings_per_click': 0.0,
-                'category_stats': {},
-                'source_stats': {},
-                'timestamp': datetime.now().isoformat()
-            }), 200
+            return _empty_stats_response('Statistics temporarily unavailable')
     
     @app.route('/api/deals')
+    @cached_response(api_cache, ttl=10)
     def api_deals():
         """Live deals API endpoint - ONLY REAL DATA."""
         try:
@@ -269,7 +460,7 @@ def create_app(config: Config):
             
             data_manager = getattr(app, 'data_manager', None)
             if not data_manager or not data_manager.db_manager:
-                return jsonify([])
+                return _empty_list_response()
             
             # Get real deals from database
             deals = data_manager.execute_async(
@@ -279,41 +470,17 @@ def create_app(config: Config):
             )
             
             if not deals:
-                return jsonify([])
-            
-            # Convert deals to API format with safe attribute access
-            deals_data = []
-            for deal in deals:
-                try:
-                    deal_dict = {
-                        'id': getattr(deal, 'id', None),
-                        'title': str(getattr(deal, 'title', '') or ''),
-                        'price': str(getattr(deal, 'price', '') or ''),
-                        'discount': str(getattr(deal, 'discount', '') or ''),
-                        'category': str(getattr(deal, 'category', '') or ''),
-                        'source': str(getattr(deal, 'source', '') or ''),
-                        'asin': str(getattr(deal, 'asin', '') or ''),
-                        'clicks': safe_int(getattr(deal, 'clicks', 0)),
-                        'conversions': safe_int(getattr(deal, 'conversions', 0)),
-                        'earnings': safe_float(getattr(deal, 'earnings', 0.0)),
-                        'posted_at': getattr(deal, 'posted_at', None).isoformat() if getattr(deal, 'posted_at', None) else None,
-                        'affiliate_link': str(getattr(deal, 'affiliate_link', '') or ''),
-                        'rating': safe_float(getattr(deal, 'rating', 0.0)),
-                        'review_count': safe_int(getattr(deal, 'review_count', 0)),
-                        'is_active': bool(getattr(deal, 'is_active', True))
-                    }
-                    deals_data.append(deal_dict)
-                except Exception as e:
-                    logger.error(f"Error processing deal: {e}")
-                    continue
+                return _empty_list_response()
             
-            return jsonify(deals_data)
+            # Convert deals to API format
+            return _ojsonify([_serialize_deal(deal) for deal in deals])
             
         except Exception as e:
             logger.error(f"Deals API error: {e}")
-            return jsonify([])
+            return _empty_list_response()
     
     @app.route('/api/users')
+    @cached_response(api_cache, ttl=10)
     def api_users():
         """Live user analytics API endpoint - ONLY REAL DATA."""
         try:
@@ -321,7 +488,7 @@ def create_app(config: Config):
             
             data_manager = getattr(app, 'data_manager', None)
             if not data_manager or not data_manager.db_manager:
-                return jsonify([])
+                return _empty_list_response()
             
             # Get real users from database
             users = data_manager.execute_async(
@@ -329,43 +496,21 @@ def create_app(config: Config):
             )
             
             if not users:
-                return jsonify([])
-            
-            # Convert users to API format with safe attribute access
-            users_data = []
-            for user in users:
-                try:
-                    user_dict = {
-                        'id': getattr(user, 'id', None),
-                        'user_id': safe_int(getattr(user, 'user_id', 0)),
-                        'username': getattr(user, 'username', None),
-                        'first_name': getattr(user, 'first_name', None),
-                        'last_name': getattr(user, 'last_name', None),
-                        'category': str(getattr(user, 'category', 'all') or 'all'),
-                        'region': str(getattr(user, 'region', 'US') or 'US'),
-                        'total_clicks': safe_int(getattr(user, 'total_clicks', 0)),
-                        'total_conversions': safe_int(getattr(user, 'total_conversions', 0)),
-                        'total_earnings': safe_float(getattr(user, 'total_earnings', 0.0)),
-                        'joined_at': getattr(user, 'joined_at', None).isoformat() if getattr(user, 'joined_at', None) else None,
-                        'last_seen': getattr(user, 'last_seen', None).isoformat() if getattr(user, 'last_seen', None) else None,
-                        'is_active': bool(getattr(user, 'is_active', True))
-                    }
-                    users_data.append(user_dict)
-                except Exception as e:
-                    logger.error(f"Error processing user: {e}")
-                    continue
+                return _empty_list_response()
             
-            return jsonify(users_data)
+            # Convert users to API format
+            return _ojsonify([_serialize_user(user) for user in users])
             
         except Exception as e:
             logger.error(f"Users API error: {e}")
-            return jsonify([])
+            return _empty_list_response()
     
     @app.route('/api/config')
+    @cached_response(api_cache, ttl=60)
     def api_config():
         """Configuration API endpoint."""
         try:
-            return jsonify({
+            return _ojsonify({
                 'affiliate_id': config.AFFILIATE_ID,
                 'supported_regions': config.get_supported_regions() if hasattr(config, 'get_supported_regions') else ['US'],
                 'default_region': getattr(config, 'DEFAULT_REGION', 'US'),
@@ -377,59 +522,85 @@ def create_app(config: Config):
             })
         except Exception as e:
             logger.error(f"Config API error: {e}")
-            return jsonify({'error': 'Configuration unavailable'}), 500
+            return _ojsonify({'error': 'Configuration unavailable'}), 500
     
     @app.route('/api/health')
+    @cached_response(api_cache, ttl=2)
     def api_health():
         """Health check endpoint."""
         try:
             data_manager = getattr(app, 'data_manager', None)
             db_healthy = False
             
-            if data_manager and hasattr(data_manager, 'db_manager') and data_manager.db_manager is not None:
-                # Test database connection
-                if hasattr(data_manager, 'execute_async'):
-                    try:
-                        test_stats = data_manager.execute_async(data_manager.db_manager.get_deal_stats())
-                        db_healthy = test_stats is not None
-                    except:
-                        db_healthy = False
-                else:
-                    db_healthy = True  # Simple database manager
+            if data_manager and data_manager.db_manager is not None:
+                # Cheap SELECT 1 round trip instead of a full stats aggregation
+                db_healthy = bool(data_manager.execute_async(data_manager.db_manager.ping(), timeout=2))
             
-            return jsonify({
+            return _ojsonify({
                 'status': 'healthy' if db_healthy else 'degraded',
                 'database': 'connected' if db_healthy else 'disconnected',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': datetime.now()
             })
             
         except Exception as e:
             logger.error(f"Health check error: {e}")
-            return jsonify({
+            return _ojsonify({
                 'status': 'unhealthy',
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': datetime.now()
             }), 503
     
     @app.errorhandler(404)
     def not_found(error):
-        return jsonify({'error': 'Endpoint not found'}), 404
+        return _ojsonify({'error': 'Endpoint not found'}), 404
     
     @app.errorhandler(500)  
     def internal_error(error):
         logger.error(f"Internal server error: {error}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return _ojsonify({'error': 'Internal server error'}), 500
     
     return app
 
 
+_wsgi_app = None
+
+def __getattr__(name):
+    """Build the module-level WSGI `app` on first access (`gunicorn web_dashboard_clean:app`)."""
+    global _wsgi_app
+    if name == 'app':
+        if _wsgi_app is None:
+            # Under gunicorn the __main__ logging setup is gone after exec; no-op if already configured
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
+            _wsgi_app = create_app(Config())
+        return _wsgi_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def run_production_dashboard():
     """Run the production dashboard."""
+    port = int(os.environ.get("PORT", 5000))
+    
+    # Serve through gunicorn's threaded workers when available (not on Windows)
+    if shutil.which('gunicorn'):
+        logger.info(f"Starting production web dashboard with gunicorn on http://0.0.0.0:{port}")
+        os.execvp('gunicorn', [
+            'gunicorn',
+            '--bind', f'0.0.0.0:{port}',
+            '--workers', '2',
+            '--threads', '16',
+            '--worker-class', 'gthread',
+            '--chdir', os.path.dirname(os.path.abspath(__file__)),
+            '--log-level', 'info',
+            'web_dashboard_clean:app'
+        ])
+    
     config = Config()
     app = create_app(config)
     
-    logger.info("Starting production web dashboard on http://0.0.0.0:5000")
-    port = int(os.environ.get("PORT", 5000))
+    logger.info(f"Starting web dashboard with the Flask development server on http://0.0.0.0:{port}")
     app.run(
         host='0.0.0.0',
         port=port,